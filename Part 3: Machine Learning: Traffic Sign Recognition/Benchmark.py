@@ -0,0 +1,322 @@
+
+# Training throughput benchmark for the traffic sign CNN ----------------------
+#
+# Trains the same Sequential model as ModelTraining.py for a fixed number of
+# steps and sweeps batch size, intra-op / inter-op thread counts and mixed
+# precision on CPU. Every configuration runs in its own subprocess because
+# TensorFlow only accepts thread settings before its runtime starts, and it
+# also keeps the peak RSS of one run from leaking into the next.
+#
+# Example:
+#   python Benchmark.py --batch-sizes 32 64 128 --intra-op 1 4 --inter-op 1 2 \
+#       --precision float32 mixed_bfloat16 --output bench_report.json
+#
+#   python Benchmark.py --data gtsrb_cache.npz --compare bench_report.json
+#
+#   python Benchmark.py --smoke --output smoke_report.json
+
+
+import argparse
+import itertools
+import json
+import logging
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="[%(asctime)s] %(levelname)s - %(message)s",
+    datefmt="%H:%M:%S"
+)
+logger = logging.getLogger(__name__)
+
+IMG_SHAPE = (30, 30, 3)
+NUM_CLASSES = 43
+PRECISIONS = ["float32", "mixed_float16", "mixed_bfloat16"]
+
+
+def build_model():
+    """Same architecture as ModelTraining.py."""
+    from tensorflow.keras import layers, models
+
+    model = models.Sequential([
+        layers.Conv2D(32, (3,3), activation='relu', input_shape=IMG_SHAPE),
+        layers.MaxPooling2D(2,2),
+        layers.Conv2D(64, (3,3), activation='relu'),
+        layers.MaxPooling2D(2,2),
+        layers.Flatten(),
+        layers.Dense(128, activation='relu'),
+        layers.Dropout(0.5),
+        # softmax stays in float32 so mixed precision does not lose accuracy
+        layers.Dense(NUM_CLASSES, activation='softmax', dtype='float32')
+    ])
+    model.compile(optimizer='adam', loss='sparse_categorical_crossentropy', metrics=['accuracy'])
+    return model
+
+
+def load_data(path: Optional[str], num_samples: int, seed: int):
+    """Load cached X_train/y_train from an .npz file, or make synthetic data.
+
+    A cache can be written from the notebook after Preprocessing.py with
+    np.savez("gtsrb_cache.npz", X_train=X_train, y_train=y_train)
+    """
+    if path:
+        with np.load(path) as data:
+            X, y = data["X_train"], data["y_train"]
+        return X.astype(np.float32), y.astype(np.int64)
+
+    rng = np.random.default_rng(seed)
+    X = rng.random((num_samples,) + IMG_SHAPE, dtype=np.float32)
+    y = rng.integers(0, NUM_CLASSES, size=num_samples, dtype=np.int64)
+    return X, y
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return rss / (1024 * 1024)
+    return rss / 1024
+
+
+def run_config(cfg: dict) -> dict:
+    """Train for a fixed number of steps with one configuration and time it."""
+    import tensorflow as tf
+
+    tf.config.threading.set_intra_op_parallelism_threads(cfg["intra_op"])
+    tf.config.threading.set_inter_op_parallelism_threads(cfg["inter_op"])
+    tf.config.set_visible_devices([], "GPU")
+    tf.keras.mixed_precision.set_global_policy(cfg["precision"])
+    tf.keras.utils.set_random_seed(cfg["seed"])
+
+    batch_size = cfg["batch_size"]
+    X, y = load_data(cfg["data"], max(cfg["num_samples"], batch_size), cfg["seed"])
+    batches = [
+        (X[i:i + batch_size], y[i:i + batch_size])
+        for i in range(0, len(X) - batch_size + 1, batch_size)
+    ]
+
+    model = build_model()
+
+    # The first step includes graph tracing, so it is reported on its own
+    start = time.perf_counter()
+    model.train_on_batch(*batches[0])
+    first_step = time.perf_counter() - start
+
+    for step in range(cfg["warmup_steps"]):
+        model.train_on_batch(*batches[(step + 1) % len(batches)])
+
+    start = time.perf_counter()
+    for step in range(cfg["steps"]):
+        loss = model.train_on_batch(*batches[step % len(batches)], return_dict=True)["loss"]
+    elapsed = time.perf_counter() - start
+    # Read before profiling so the profiler's buffers are not counted either
+    peak_rss = peak_rss_mb()
+
+    # The trace is recorded over extra steps so its overhead never ends up
+    # in the throughput or memory numbers
+    if cfg["profile_dir"]:
+        tf.profiler.experimental.start(cfg["profile_dir"])
+        for step in range(min(cfg["steps"], 10)):
+            model.train_on_batch(*batches[step % len(batches)])
+        tf.profiler.experimental.stop()
+
+    return {
+        **cfg,
+        "time_to_first_step_s": round(first_step, 4),
+        "steps_per_sec": round(cfg["steps"] / elapsed, 3),
+        "samples_per_sec": round(cfg["steps"] * batch_size / elapsed, 1),
+        "final_loss": float(loss),
+        "peak_rss_mb": round(peak_rss, 1),
+    }
+
+
+def run_in_subprocess(cfg: dict) -> dict:
+    proc = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--single", json.dumps(cfg)],
+        capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        logger.error(f"Configuration {cfg} failed:\n{proc.stderr.strip()}")
+        return {**cfg, "error": proc.stderr.strip().splitlines()[-1:]}
+    # The result is always the last line; TensorFlow may log above it
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def environment_info() -> dict:
+    try:
+        tf_version = subprocess.run(
+            [sys.executable, "-c", "import tensorflow as tf; print(tf.__version__)"],
+            capture_output=True, text=True
+        ).stdout.strip().splitlines()[-1]
+    except IndexError:
+        tf_version = None
+    return {
+        "python": platform.python_version(),
+        "tensorflow": tf_version,
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def config_key(result: dict) -> tuple:
+    # Runs are only comparable when they trained on the same data for the same number of steps.
+    # The sample count only matters for synthetic data; a cache is always used in full.
+    data = os.path.abspath(result["data"]) if result["data"] else None
+    return (
+        result["batch_size"], result["intra_op"], result["inter_op"], result["precision"],
+        data, result["steps"], result["warmup_steps"], None if data else result["num_samples"],
+    )
+
+
+def compare(results: List[dict], baseline_path: str, tolerance: float) -> List[str]:
+    """Return a message for every configuration that got slower than the baseline."""
+    with open(baseline_path) as f:
+        baseline: Dict[tuple, dict] = {config_key(r): r for r in json.load(f)["results"] if "error" not in r}
+
+    regressions = []
+    for r in results:
+        if "error" in r:
+            continue
+        old = baseline.get(config_key(r))
+        if old is None:
+            logger.warning(
+                f"Baseline has no run matching batch={r['batch_size']} intra={r['intra_op']} "
+                f"inter={r['inter_op']} {r['precision']} with the same data and step settings, "
+                f"skipping comparison"
+            )
+            continue
+        change = r["steps_per_sec"] / old["steps_per_sec"] - 1
+        r["baseline_steps_per_sec"] = old["steps_per_sec"]
+        r["change"] = round(change, 4)
+        if change < -tolerance:
+            regressions.append(
+                f"batch={r['batch_size']} intra={r['intra_op']} inter={r['inter_op']} "
+                f"{r['precision']}: {old['steps_per_sec']} -> {r['steps_per_sec']} steps/sec ({change:+.1%})"
+            )
+    return regressions
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description="Benchmark CNN training throughput on CPU.")
+    p.add_argument("--batch-sizes", type=int, nargs="+", default=[32, 64, 128])
+    p.add_argument("--intra-op", type=int, nargs="+", default=[0],
+                   help="intra-op thread counts to try (0 lets TensorFlow decide)")
+    p.add_argument("--inter-op", type=int, nargs="+", default=[0],
+                   help="inter-op thread counts to try (0 lets TensorFlow decide)")
+    p.add_argument("--precision", nargs="+", choices=PRECISIONS, default=["float32"])
+    p.add_argument("--steps", type=int, default=100, help="timed training steps per configuration")
+    p.add_argument("--warmup-steps", type=int, default=10)
+    p.add_argument("--num-samples", type=int, default=2048, help="size of the synthetic dataset")
+    p.add_argument("--data", help=".npz file with X_train and y_train instead of synthetic data")
+    p.add_argument("--seed", type=int, default=42)
+    p.add_argument("--profile-dir", help="write a TensorFlow profiler trace per configuration here")
+    p.add_argument("--output", default="bench_report.json")
+    p.add_argument("--compare", help="earlier report to check for regressions")
+    p.add_argument("--tolerance", type=float, default=0.10,
+                   help="allowed steps/sec drop against --compare before failing")
+    p.add_argument("--smoke", action="store_true",
+                   help="quick check of the harness: 2 steps at batch size 8 for every precision, with a trace")
+    p.add_argument("--single", help=argparse.SUPPRESS)
+    args = p.parse_args(argv)
+    if args.single:
+        return args
+
+    if args.smoke:
+        args.batch_sizes, args.intra_op, args.inter_op = [8], [0], [0]
+        args.precision = PRECISIONS
+        args.steps, args.warmup_steps, args.num_samples = 2, 0, 16
+        args.profile_dir = args.profile_dir or tempfile.mkdtemp(prefix="bench_trace_")
+
+    if min(args.batch_sizes) < 1:
+        p.error("--batch-sizes must all be at least 1")
+    if min(args.intra_op) < 0 or min(args.inter_op) < 0:
+        p.error("--intra-op and --inter-op must not be negative")
+    if args.steps < 1:
+        p.error("--steps must be at least 1")
+    if args.warmup_steps < 0:
+        p.error("--warmup-steps must not be negative")
+    if args.num_samples < 1:
+        p.error("--num-samples must be at least 1")
+    if args.tolerance < 0:
+        p.error("--tolerance must not be negative")
+    if args.data:
+        if not os.path.isfile(args.data):
+            p.error(f"--data file not found: {args.data}")
+        with np.load(args.data) as data:
+            rows = len(data["y_train"])
+        if rows < max(args.batch_sizes):
+            p.error(
+                f"--data has only {rows} samples, fewer than the largest batch size "
+                f"({max(args.batch_sizes)})"
+            )
+    return args
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    if args.single:
+        print(json.dumps(run_config(json.loads(args.single))))
+        return 0
+
+    results = []
+    sweep = list(itertools.product(args.batch_sizes, args.intra_op, args.inter_op, args.precision))
+    for n, (batch_size, intra, inter, precision) in enumerate(sweep, 1):
+        cfg = {
+            "batch_size": batch_size,
+            "intra_op": intra,
+            "inter_op": inter,
+            "precision": precision,
+            "steps": args.steps,
+            "warmup_steps": args.warmup_steps,
+            "num_samples": args.num_samples,
+            "data": os.path.abspath(args.data) if args.data else None,
+            "seed": args.seed,
+            "profile_dir": None,
+        }
+        if args.profile_dir:
+            cfg["profile_dir"] = os.path.join(
+                args.profile_dir, f"b{batch_size}_intra{intra}_inter{inter}_{precision}"
+            )
+
+        logger.info(f"[{n}/{len(sweep)}] batch={batch_size} intra={intra} inter={inter} {precision}")
+        r = run_in_subprocess(cfg)
+        if "error" not in r:
+            logger.info(
+                f"    {r['steps_per_sec']} steps/sec, first step {r['time_to_first_step_s']}s, "
+                f"peak RSS {r['peak_rss_mb']} MB"
+            )
+        results.append(r)
+
+    regressions = compare(results, args.compare, args.tolerance) if args.compare else []
+
+    report = {
+        "environment": environment_info(),
+        "dataset": args.data or "synthetic",
+        "results": results,
+        "regressions": regressions,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    logger.info(f"Report written to {args.output}")
+
+    for msg in regressions:
+        logger.warning(f"Regression: {msg}")
+    if regressions or any("error" in r for r in results):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
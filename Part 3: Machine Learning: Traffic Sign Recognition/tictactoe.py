@@ -0,0 +1,316 @@
+"""
+Tic-Tac-Toe engine used by runner.py.
+
+Boards handed to runner.py are immutable 3x3 tuples of X, O and EMPTY. The
+search itself works on bitboards: one 9-bit mask per player, cell (i, j)
+being bit 3*i + j. Positions are memoised in a transposition table keyed by
+the smallest of their 8 rotations/reflections, so symmetric positions are
+only ever searched once.
+
+Running this file directly plays headless Computer vs Computer games:
+    python tictactoe.py --games 5000 --x hard --o medium
+"""
+
+import argparse
+import random
+import time
+from typing import Dict, Optional, Set, Tuple
+
+X = "X"
+O = "O"
+EMPTY = None
+
+Board = Tuple[Tuple[Optional[str], ...], ...]
+Move = Tuple[int, int]
+
+DIFFICULTIES = ["easy", "medium", "hard"]
+
+FULL = 0b111111111
+LINES = [
+    0b000000111, 0b000111000, 0b111000000,  # rows
+    0b001001001, 0b010010010, 0b100100100,  # columns
+    0b100010001, 0b001010100,               # diagonals
+]
+# Center first, then corners, then edges - cuts off far more branches
+MOVE_ORDER = [4, 0, 2, 6, 8, 1, 3, 5, 7]
+
+
+def _build_symmetries():
+    """Lookup tables mapping every 9-bit mask to its 8 symmetric images."""
+    transforms = [
+        lambda i, j: (i, j),
+        lambda i, j: (j, 2 - i),
+        lambda i, j: (2 - i, 2 - j),
+        lambda i, j: (2 - j, i),
+        lambda i, j: (i, 2 - j),
+        lambda i, j: (2 - i, j),
+        lambda i, j: (j, i),
+        lambda i, j: (2 - j, 2 - i),
+    ]
+    tables = []
+    for f in transforms:
+        perm = [3 * f(i, j)[0] + f(i, j)[1] for i in range(3) for j in range(3)]
+        table = []
+        for mask in range(FULL + 1):
+            image = 0
+            for bit in range(9):
+                if mask >> bit & 1:
+                    image |= 1 << perm[bit]
+            table.append(image)
+        tables.append(table)
+    return tables
+
+
+SYMMETRIES = _build_symmetries()
+
+# canonical (me, opp) key -> (score, flag); the score is from the side to move
+EXACT, LOWER, UPPER = 0, 1, 2
+transposition_table: Dict[int, Tuple[int, int]] = {}
+stats = {"positions": 0, "lookups": 0, "hits": 0}
+
+
+def initial_state() -> Board:
+    """Returns starting state of the board."""
+    return ((EMPTY,) * 3,) * 3
+
+
+def _to_bits(board: Board) -> Tuple[int, int]:
+    x_bits = o_bits = 0
+    for i, row in enumerate(board):
+        for j, cell in enumerate(row):
+            if cell == X:
+                x_bits |= 1 << (3 * i + j)
+            elif cell == O:
+                o_bits |= 1 << (3 * i + j)
+    return x_bits, o_bits
+
+
+def _from_bits(x_bits: int, o_bits: int) -> Board:
+    def cell(bit):
+        if x_bits >> bit & 1:
+            return X
+        if o_bits >> bit & 1:
+            return O
+        return EMPTY
+    return tuple(tuple(cell(3 * i + j) for j in range(3)) for i in range(3))
+
+
+def _has_line(bits: int) -> bool:
+    for line in LINES:
+        if bits & line == line:
+            return True
+    return False
+
+
+def player(board: Board) -> str:
+    """Returns the player who has the next turn on a board."""
+    x_bits, o_bits = _to_bits(board)
+    return X if bin(x_bits).count("1") == bin(o_bits).count("1") else O
+
+
+def actions(board: Board) -> Set[Move]:
+    """Returns set of all possible actions (i, j) available on the board."""
+    return {(i, j) for i in range(3) for j in range(3) if board[i][j] is EMPTY}
+
+
+def result(board: Board, action: Move) -> Board:
+    """Returns the board that results from making move (i, j) on the board."""
+    i, j = action
+    if not (0 <= i < 3 and 0 <= j < 3) or board[i][j] is not EMPTY:
+        raise ValueError(f"Invalid move: {action}")
+    row = board[i][:j] + (player(board),) + board[i][j + 1:]
+    return board[:i] + (row,) + board[i + 1:]
+
+
+def winner(board: Board) -> Optional[str]:
+    """Returns the winner of the game, if there is one."""
+    x_bits, o_bits = _to_bits(board)
+    if _has_line(x_bits):
+        return X
+    if _has_line(o_bits):
+        return O
+    return None
+
+
+def terminal(board: Board) -> bool:
+    """Returns True if game is over, False otherwise."""
+    x_bits, o_bits = _to_bits(board)
+    return _has_line(x_bits) or _has_line(o_bits) or (x_bits | o_bits) == FULL
+
+
+def utility(board: Board) -> int:
+    """Returns 1 if X has won the game, -1 if O has won, 0 otherwise."""
+    return {X: 1, O: -1, None: 0}[winner(board)]
+
+
+def _canonical(me: int, opp: int) -> int:
+    return min((table[me] << 9) | table[opp] for table in SYMMETRIES)
+
+
+def _negamax(me: int, opp: int, alpha: int, beta: int) -> int:
+    """Score of the position for the side to move (me).
+
+    A win scores 1 + the number of empty cells left, so quicker wins and
+    slower losses are preferred; a draw scores 0.
+    """
+    stats["positions"] += 1
+    occupied = me | opp
+    if _has_line(opp):
+        return -(10 - bin(occupied).count("1"))
+    if occupied == FULL:
+        return 0
+
+    alpha_orig = alpha
+    key = _canonical(me, opp)
+    stats["lookups"] += 1
+    entry = transposition_table.get(key)
+    if entry is not None:
+        stats["hits"] += 1
+        score, flag = entry
+        if flag == EXACT:
+            return score
+        if flag == LOWER:
+            alpha = max(alpha, score)
+        else:
+            beta = min(beta, score)
+        if alpha >= beta:
+            return score
+
+    best = -100
+    for bit in MOVE_ORDER:
+        if occupied >> bit & 1:
+            continue
+        score = -_negamax(opp, me | 1 << bit, -beta, -alpha)
+        if score > best:
+            best = score
+        if best > alpha:
+            alpha = best
+        if alpha >= beta:
+            break
+
+    if best <= alpha_orig:
+        flag = UPPER
+    elif best >= beta:
+        flag = LOWER
+    else:
+        flag = EXACT
+    transposition_table[key] = (best, flag)
+    return best
+
+
+def _split(board: Board) -> Tuple[int, int]:
+    """Bitboards as (side to move, opponent)."""
+    x_bits, o_bits = _to_bits(board)
+    if bin(x_bits).count("1") == bin(o_bits).count("1"):
+        return x_bits, o_bits
+    return o_bits, x_bits
+
+
+def minimax(board: Board) -> Optional[Move]:
+    """Returns an optimal action for the current player, None if the game is over.
+
+    Ties between equally good moves are broken at random so games vary.
+    """
+    if terminal(board):
+        return None
+    me, opp = _split(board)
+    best_score, best_moves = -100, []
+    for bit in MOVE_ORDER:
+        if (me | opp) >> bit & 1:
+            continue
+        # full window so every root score is exact and ties are real ties
+        score = -_negamax(opp, me | 1 << bit, -100, 100)
+        if score > best_score:
+            best_score, best_moves = score, [bit]
+        elif score == best_score:
+            best_moves.append(bit)
+    return divmod(random.choice(best_moves), 3)
+
+
+def _heuristic_move(board: Board) -> Move:
+    """Win if possible, otherwise block the opponent, otherwise play randomly."""
+    me, opp = _split(board)
+    free = [bit for bit in range(9) if not (me | opp) >> bit & 1]
+    for bits in (me, opp):
+        for bit in free:
+            if _has_line(bits | 1 << bit):
+                return divmod(bit, 3)
+    return divmod(random.choice(free), 3)
+
+
+def ai_move(board: Board, difficulty: str = "hard") -> Optional[Move]:
+    """Returns the computer's move for the given difficulty.
+
+    easy   - a random legal move
+    medium - takes a winning move or blocks one, otherwise random
+    hard   - perfect play with alpha-beta minimax
+    """
+    if terminal(board):
+        return None
+    if difficulty == "easy":
+        return random.choice(sorted(actions(board)))
+    if difficulty == "medium":
+        return _heuristic_move(board)
+    if difficulty == "hard":
+        return minimax(board)
+    raise ValueError(f"Unknown difficulty: {difficulty}")
+
+
+def benchmark(games: int, x_level: str, o_level: str) -> dict:
+    """Play AI vs AI games headlessly and report search statistics."""
+    # Start cold so every run measures the same work
+    transposition_table.clear()
+    for k in stats:
+        stats[k] = 0
+    outcomes = {X: 0, O: 0, "tie": 0}
+    moves = 0
+    think_time = 0.0
+
+    for _ in range(games):
+        board = initial_state()
+        while not terminal(board):
+            level = x_level if player(board) == X else o_level
+            start = time.perf_counter()
+            move = ai_move(board, level)
+            think_time += time.perf_counter() - start
+            board = result(board, move)
+            moves += 1
+        outcomes[winner(board) or "tie"] += 1
+
+    return {
+        "games": games,
+        "x_wins": outcomes[X],
+        "o_wins": outcomes[O],
+        "ties": outcomes["tie"],
+        "moves": moves,
+        "positions_searched": stats["positions"],
+        "cache_entries": len(transposition_table),
+        "cache_hit_rate": stats["hits"] / stats["lookups"] if stats["lookups"] else 0.0,
+        "ms_per_move": 1000 * think_time / moves if moves else 0.0,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless Computer vs Computer self-play benchmark.")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--x", choices=DIFFICULTIES, default="hard", help="strength of computer X")
+    parser.add_argument("--o", choices=DIFFICULTIES, default="hard", help="strength of computer O")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+    if args.games < 1:
+        parser.error("--games must be at least 1")
+
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    report = benchmark(args.games, args.x, args.o)
+    print(f"Games played:       {report['games']} (X {args.x} vs O {args.o})")
+    print(f"X wins / O wins / ties: {report['x_wins']} / {report['o_wins']} / {report['ties']}")
+    print(f"Positions searched: {report['positions_searched']}")
+    print(f"Cache entries:      {report['cache_entries']}")
+    print(f"Cache hit rate:     {report['cache_hit_rate']:.1%}")
+    print(f"Time per move:      {report['ms_per_move']:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()